@@ -0,0 +1,104 @@
+"""Measure the memory saved by StringPool on a synthetic M2 corpus.
+
+Usage:
+    python benchmarks/string_pool.py --num_sents 1000000
+
+Each setting runs in a fresh process, and the RSS growth while loading
+the two references of the corpus is reported. Linux only (/proc is used).
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import random
+import time
+from gecommon import Parallel, StringPool
+
+
+def make_m2(num_sents: int, seed: int = 0) -> list[str]:
+    """Generate a synthetic M2 corpus with two references.
+
+    Each sentence has 15 tokens, and each reference has 0-3 one-token edits.
+    """
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(5000)] + ["the", "a", ",", "."]
+    etypes = [
+        "R:VERB:SVA",
+        "M:DET",
+        "U:DET",
+        "R:SPELL",
+        "R:PREP",
+        "M:PUNCT",
+        "R:NOUN:NUM",
+    ]
+    c_strs = ["the", "a", ",", "is", "in", "on", "", "are"]
+    m2 = []
+    for _ in range(num_sents):
+        lines = ["S " + " ".join(rng.choices(vocab, k=15))]
+        for ref_id in range(2):
+            for pos in sorted(rng.sample(range(15), rng.randint(0, 3))):
+                etype = rng.choice(etypes)
+                c_str = rng.choice(c_strs)
+                lines.append(
+                    f"A {pos} {pos+1}|||{etype}|||{c_str}|||REQUIRED|||-NONE-|||{ref_id}"
+                )
+        m2.append("\n".join(lines))
+    return m2
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(num_sents: int, use_pool: bool, queue: multiprocessing.Queue) -> None:
+    m2 = make_m2(num_sents)
+    gc.collect()
+    before = rss()
+    pool = StringPool() if use_pool else None
+    start = time.time()
+    refs = [Parallel(m2=m2, ref_id=ref_id, pool=pool) for ref_id in range(2)]
+    gc.collect()
+    queue.put(
+        {
+            "rss_mib": (rss() - before) / 2**20,
+            "seconds": time.time() - start,
+            "num_sents": sum(ref.num_sents for ref in refs),
+            "pool_stats": pool.stats() if pool is not None else None,
+        }
+    )
+
+
+def main():
+    args = get_parser()
+    results = dict()
+    for use_pool in [False, True]:
+        queue = multiprocessing.Queue()
+        proc = multiprocessing.Process(
+            target=measure, args=(args.num_sents, use_pool, queue)
+        )
+        proc.start()
+        results[use_pool] = queue.get()
+        proc.join()
+    for use_pool, name in [(False, "without pool"), (True, "with pool")]:
+        r = results[use_pool]
+        print(f"{name:12}: {r['rss_mib']:8.1f} MiB {r['seconds']:6.1f} s")
+    saved = results[False]["rss_mib"] - results[True]["rss_mib"]
+    print(f"RSS saved   : {saved:8.1f} MiB ({saved / results[False]['rss_mib'] * 100:.1f}%)")
+    stats = results[True]["pool_stats"]
+    print("pool.stats():", stats)
+    print(f"bytes_saved : {stats['bytes_saved'] / 2**20:8.1f} MiB (gross)")
+    print(f"pool_bytes  : {stats['pool_bytes'] / 2**20:8.1f} MiB")
+    print(f"net saved   : {stats['net_bytes_saved'] / 2**20:8.1f} MiB")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_sents", type=int, default=1000000)
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    main()
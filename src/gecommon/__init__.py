@@ -1,5 +1,7 @@
 from .parallel import Parallel, Edit
 from .cached_errant import CachedERRANT
+from .edit_index import EditIndex
+from .string_pool import StringPool
 from .utils import *
 
-__all__ = ["Parallel", "Edit", "CachedERRANT"]
+__all__ = ["Parallel", "Edit", "CachedERRANT", "EditIndex", "StringPool"]
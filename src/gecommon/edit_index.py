@@ -0,0 +1,207 @@
+from typing import List, Tuple, Optional, Dict
+import hashlib
+import json
+from .parallel import Parallel
+
+
+class EditIndex:
+    """Inverted index of edits over a Parallel instance.
+
+    The index is built in one pass and consists of:
+        - etype2sents: {error type: sentence ids}, e.g. {"R:VERB:SVA": [0, 5]}.
+        - n_edits2sents: {number of edits: sentence ids}.
+        - c_str2edits: {correction string: [(sentence id, edit id), ...]}.
+    """
+
+    def __init__(
+        self,
+        num_sents: int,
+        etype2sents: Dict[str, List[int]],
+        n_edits2sents: Dict[int, List[int]],
+        c_str2edits: Dict[str, List[Tuple[int, int]]],
+        fingerprint: str,
+    ):
+        """Initialize an EditIndex instance.
+        Usually, use from_parallel() or load() instead.
+
+        Args:
+            num_sents (int): The number of sentences of the indexed corpus.
+            etype2sents (dict[str, list[int]]): {error type: sentence ids}.
+            n_edits2sents (dict[int, list[int]]): {number of edits: sentence ids}.
+            c_str2edits (dict[str, list[tuple[int, int]]]):
+                {correction string: [(sentence id, edit id), ...]}.
+            fingerprint (str): The fingerprint of the indexed corpus
+                to detect pairing with a different corpus.
+        """
+        self.num_sents = num_sents
+        self.etype2sents = etype2sents
+        self.n_edits2sents = n_edits2sents
+        self.c_str2edits = c_str2edits
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_parallel(cls, gec: Parallel) -> "EditIndex":
+        """Build an index from a Parallel instance.
+
+        Args:
+            gec (Parallel): The Parallel instance to be indexed.
+
+        Returns:
+            EditIndex: The EditIndex instance.
+        """
+        etype2sents: Dict[str, List[int]] = dict()
+        n_edits2sents: Dict[int, List[int]] = dict()
+        c_str2edits: Dict[str, List[Tuple[int, int]]] = dict()
+        hasher = hashlib.sha256()
+        for sent_id, (src, edits) in enumerate(zip(gec.srcs, gec.edits_list)):
+            _update_fingerprint(hasher, src, edits)
+            n_edits2sents.setdefault(len(edits), []).append(sent_id)
+            for edit_id, e in enumerate(edits):
+                sents = etype2sents.setdefault(e.type, [])
+                # Avoid duplicates when a sentence has several edits of the same type.
+                if len(sents) == 0 or sents[-1] != sent_id:
+                    sents.append(sent_id)
+                c_str2edits.setdefault(e.c_str, []).append((sent_id, edit_id))
+        return cls(
+            num_sents=len(gec.edits_list),
+            etype2sents=etype2sents,
+            n_edits2sents=n_edits2sents,
+            c_str2edits=c_str2edits,
+            fingerprint=hasher.hexdigest(),
+        )
+
+    @staticmethod
+    def compute_fingerprint(gec: Parallel) -> str:
+        """Compute the fingerprint of a Parallel instance
+        from every source sentence and its edits (o_start, o_end, type, c_str).
+        This distinguishes e.g. different references of the same M2 file.
+
+        Args:
+            gec (Parallel): The Parallel instance.
+
+        Returns:
+            str: The fingerprint.
+        """
+        hasher = hashlib.sha256()
+        for src, edits in zip(gec.srcs, gec.edits_list):
+            _update_fingerprint(hasher, src, edits)
+        return hasher.hexdigest()
+
+    def sents_with_etype(self, etype: str) -> List[int]:
+        """Get sentence ids that have the edits of the error type.
+
+        Args:
+            etype (str): Error type, e.g. "R:VERB:SVA".
+
+        Returns:
+            list[int]: Sorted sentence ids.
+        """
+        return list(self.etype2sents.get(etype, []))
+
+    def sents_with_n_edits(
+        self, min_n: int = 0, max_n: Optional[int] = None
+    ) -> List[int]:
+        """Get sentence ids whose number of edits is in [min_n, max_n].
+
+        Args:
+            min_n (int): The minimum number of edits (inclusive).
+            max_n (Optional[int]): The maximum number of edits (inclusive).
+                If None, there is no upper bound.
+
+        Returns:
+            list[int]: Sorted sentence ids.
+        """
+        sent_ids = []
+        for n, sents in self.n_edits2sents.items():
+            if n >= min_n and (max_n is None or n <= max_n):
+                sent_ids += sents
+        return sorted(sent_ids)
+
+    def edits_with_c_str(self, c_str: str) -> List[Tuple[int, int]]:
+        """Get edits whose correction string is c_str.
+
+        Args:
+            c_str (str): Correction string, e.g. "the". "" means deletion edits.
+
+        Returns:
+            list[tuple[int, int]]: Sorted (sentence id, edit id) pairs.
+                The edit is gec.edits_list[sentence id][edit id].
+        """
+        return list(self.c_str2edits.get(c_str, []))
+
+    def sents_with_c_str(self, c_str: str) -> List[int]:
+        """Get sentence ids that have the edits whose correction string is c_str.
+
+        Args:
+            c_str (str): Correction string.
+
+        Returns:
+            list[int]: Sorted sentence ids.
+        """
+        return sorted(set(sent_id for sent_id, _ in self.edits_with_c_str(c_str)))
+
+    def view(self, gec: Parallel, sent_ids: List[int]) -> Parallel:
+        """Get the subset of the indexed Parallel instance without copying sentences and edits.
+
+        Args:
+            gec (Parallel): The indexed Parallel instance.
+            sent_ids (list[int]): Sentence ids returned by the query functions.
+
+        Returns:
+            Parallel: The Parallel instance that contains only the sentences.
+
+        Raises:
+            ValueError: If gec is not the indexed corpus,
+                or sent_ids contains ids out of [0, num_sents).
+        """
+        if self.compute_fingerprint(gec) != self.fingerprint:
+            raise ValueError("The Parallel instance is different from the indexed one.")
+        return gec.subset(sent_ids)
+
+    def save(self, path: str) -> None:
+        """Save the index as a JSON file, e.g. next to the corpus as "train.m2.index.json".
+
+        Args:
+            path (str): Output path.
+        """
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "num_sents": self.num_sents,
+                    "etype2sents": self.etype2sents,
+                    # JSON keys must be strings.
+                    "n_edits2sents": {str(k): v for k, v in self.n_edits2sents.items()},
+                    "c_str2edits": self.c_str2edits,
+                    "fingerprint": self.fingerprint,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "EditIndex":
+        """Load the index saved by save().
+
+        Args:
+            path (str): Path to the saved index.
+
+        Returns:
+            EditIndex: The EditIndex instance.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            num_sents=data["num_sents"],
+            etype2sents=data["etype2sents"],
+            n_edits2sents={int(k): v for k, v in data["n_edits2sents"].items()},
+            c_str2edits={
+                k: [tuple(p) for p in v] for k, v in data["c_str2edits"].items()
+            },
+            fingerprint=data["fingerprint"],
+        )
+
+
+def _update_fingerprint(hasher, src: str, edits: list) -> None:
+    hasher.update(src.encode())
+    for e in edits:
+        hasher.update(f"\n{e.o_start} {e.o_end}|||{e.type}|||{e.c_str}".encode())
+    hasher.update(b"\n\n")
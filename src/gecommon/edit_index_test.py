@@ -0,0 +1,87 @@
+from .parallel import Parallel
+from .edit_index import EditIndex
+import pytest
+
+
+class TestEditIndex:
+    @pytest.fixture(scope="class")
+    def demo_instance(self):
+        return Parallel.from_demo()
+
+    @pytest.fixture(scope="class")
+    def index(self, demo_instance):
+        return EditIndex.from_parallel(demo_instance)
+
+    def test_etype(self, index):
+        assert index.sents_with_etype("R:VERB:SVA") == [0]
+        assert index.sents_with_etype("U:VERB") == [1]
+        assert index.sents_with_etype("M:NOUN") == []
+
+    def test_n_edits(self, index):
+        assert index.sents_with_n_edits(min_n=1) == [0, 1]
+        assert index.sents_with_n_edits(min_n=3) == [0]
+        assert index.sents_with_n_edits(max_n=0) == [2]
+        assert index.sents_with_n_edits(min_n=2, max_n=2) == [1]
+
+    def test_c_str(self, index):
+        assert index.edits_with_c_str("grammatical") == [(0, 2), (1, 1)]
+        assert index.sents_with_c_str("grammatical") == [0, 1]
+        assert index.edits_with_c_str("") == [(1, 0)]
+        assert index.edits_with_c_str("the") == []
+
+    def test_view(self, demo_instance, index):
+        view = index.view(demo_instance, index.sents_with_etype("R:ORTH"))
+        assert view.srcs == ["This is are a gram matical sentence ."]
+        assert view.edits_list[0] is demo_instance.edits_list[1]
+        assert view.num_sents == 1
+        assert view.num_edits == 2
+        assert demo_instance.num_sents == 3
+
+    def test_save_load(self, index, tmp_path):
+        path = str(tmp_path / "demo.m2.index.json")
+        index.save(path)
+        loaded = EditIndex.load(path)
+        assert loaded.num_sents == index.num_sents
+        assert loaded.etype2sents == index.etype2sents
+        assert loaded.n_edits2sents == index.n_edits2sents
+        assert loaded.c_str2edits == index.c_str2edits
+
+    def test_view_different_corpus(self, demo_instance, index, tmp_path):
+        path = str(tmp_path / "demo.m2.index.json")
+        index.save(path)
+        loaded = EditIndex.load(path)
+        assert loaded.fingerprint == index.fingerprint
+        assert loaded.view(demo_instance, [1]).srcs == [demo_instance.srcs[1]]
+        # Same number of sentences, but different contents.
+        other = demo_instance.subset([1, 1, 2])
+        with pytest.raises(ValueError):
+            loaded.view(other, [0])
+
+    def test_view_other_reference(self):
+        m2 = """S This are gramamtical sentence .
+A 1 2|||R:VERB:SVA|||is|||REQUIRED|||-NONE-|||0
+A 2 3|||R:SPELL|||grammatical|||REQUIRED|||-NONE-|||1
+
+S This is a sentence .
+A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
+A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||1
+
+S This are gramamtical sentence .
+A 2 3|||R:SPELL|||grammatical|||REQUIRED|||-NONE-|||0
+A 1 2|||R:VERB:SVA|||is|||REQUIRED|||-NONE-|||1
+
+""".rstrip().split("\n\n")
+        ref0 = Parallel(m2=m2, ref_id=0)
+        ref1 = Parallel(m2=m2, ref_id=1)
+        assert ref0.srcs == ref1.srcs
+        assert ref0.num_edits == ref1.num_edits
+        index = EditIndex.from_parallel(ref0)
+        assert index.fingerprint == EditIndex.compute_fingerprint(ref0)
+        assert index.view(ref0, [0]).edits_list[0][0].type == "R:VERB:SVA"
+        with pytest.raises(ValueError):
+            index.view(ref1, index.sents_with_etype("R:VERB:SVA"))
+
+    @pytest.mark.parametrize("sent_ids", [[-1], [3], [0, 3]])
+    def test_view_out_of_range(self, demo_instance, index, sent_ids):
+        with pytest.raises(ValueError, match="out of range"):
+            index.view(demo_instance, sent_ids)
@@ -1,8 +1,101 @@
-from typing import List, Tuple, Optional, Union, Dict
-from collections import Counter
+from typing import List, Tuple, Optional, Union, Dict, Mapping
+from types import MappingProxyType
+from collections import Counter, deque
+from contextlib import ExitStack
+from array import array
+import copy
+from multiprocessing import Pool
+import json
+import os
+import sys
 import errant
 from tqdm import tqdm
 from .utils import apply_edits
+from .string_pool import StringPool
+
+
+def _build_ged_tables() -> Tuple[
+    Mapping[str, Mapping[int, str]],
+    Mapping[str, Mapping[str, int]],
+    Mapping[str, Tuple[int, int, int]],
+]:
+    """Build the label tables for error detection. This is called only once on import.
+
+    Returns:
+        Tuple containing
+            - id2label (Mapping[str, Mapping[int, str]]): {mode: {id: label}}.
+            - label2id (Mapping[str, Mapping[str, int]]): {mode: {label: id}}.
+            - etype2ids (Mapping[str, tuple[int, int, int]]):
+                {cat3 error type: (cat1 id, cat2 id, cat3 id)}.
+    """
+    mru_cats = [
+        "ADJ",
+        "ADV",
+        "CONJ",
+        "CONTR",
+        "DET",
+        "NOUN",
+        "NOUN:POSS",
+        "OTHER",
+        "PART",
+        "PREP",
+        "PRON",
+        "PUNCT",
+        "VERB",
+        "VERB:FORM",
+        "VERB:TENSE",
+    ]
+    r_cats = [
+        "ADJ:FORM",
+        "MORPH",
+        "NOUN:INFL",
+        "NOUN:NUM",
+        "ORTH",
+        "SPELL",
+        "VERB:INFL",
+        "VERB:SVA",
+        "WO",
+    ]
+    cat1 = {0: "CORRECT"}
+    cat2 = {0: "CORRECT"}
+    cat3 = {0: "CORRECT"}
+    for i, c in enumerate("MRU"):
+        cat1[i + 1] = c
+    for i, c in enumerate(mru_cats + r_cats):
+        cat2[i + 1] = c
+    cat1_label2id = {v: k for k, v in cat1.items()}
+    cat2_label2id = {v: k for k, v in cat2.items()}
+    etype2ids = dict()
+    idx = 1
+    for c1 in "MRU":
+        c2s = mru_cats + r_cats if c1 == "R" else mru_cats
+        for c2 in c2s:
+            cat3[idx] = c1 + ":" + c2
+            etype2ids[cat3[idx]] = (cat1_label2id[c1], cat2_label2id[c2], idx)
+            idx += 1
+    assert len(cat1) == 4
+    assert len(cat2) == 25
+    assert len(cat3) == 55
+
+    id2label = {
+        "bin": {0: "CORRECT", 1: "INCORRECT"},
+        "cat1": cat1,
+        "cat2": cat2,
+        "cat3": cat3,
+    }
+    label2id = {
+        mode: MappingProxyType({v: k for k, v in table.items()})
+        for mode, table in id2label.items()
+    }
+    id2label = {mode: MappingProxyType(table) for mode, table in id2label.items()}
+    return (
+        MappingProxyType(id2label),
+        MappingProxyType(label2id),
+        MappingProxyType(etype2ids),
+    )
+
+
+_GED_ID2LABEL, _GED_LABEL2ID, _ETYPE2IDS = _build_ged_tables()
 
 
 class Edit(errant.edit.Edit):
@@ -29,6 +122,7 @@ class Parallel:
         ref_id: int = 0,
         srcs: List[str] = None,
         trgs: List[str] = None,
+        pool: Optional[StringPool] = None,
     ):
         """Initialize a Parallel instance.
 
@@ -37,8 +131,12 @@ class Parallel:
             ref_id (int): Reference ID.
             srcs (list[str]): Source sentences.
             trgs (list[str]): Target sentences.
+            pool (Optional[StringPool]): If given, sentences, error types,
+                and short edit strings are deduplicated through the pool.
+                Share the same pool among instances of the same corpus to save memory.
         """
         self.srcs, self.trgs, self.edits_list = None, None, None
+        self.pool = pool
         self.GED_MODES = ["bin", "cat1", "cat2", "cat3"]
         if m2 is not None:
             self.srcs, self.trgs, self.edits_list = self.load_m2(m2, ref_id)
@@ -48,19 +146,22 @@ class Parallel:
         assert self.srcs is not None and self.edits_list is not None
 
     @classmethod
-    def from_m2(cls, m2: str, ref_id: int = 0) -> "Parallel":
+    def from_m2(
+        cls, m2: str, ref_id: int = 0, pool: Optional[StringPool] = None
+    ) -> "Parallel":
         """Make a Parallel instance from a M2 file.
 
         Args:
             m2 (str): Path to a M2 file.
             ref_id (int): Reference id.
+            pool (Optional[StringPool]): String pool for deduplication.
 
         Returns:
             Parallel: A Parallel instance.
 
         """
         m2 = open(m2).read().rstrip().split("\n\n")
-        return cls(m2=m2, ref_id=ref_id)
+        return cls(m2=m2, ref_id=ref_id, pool=pool)
 
     @classmethod
     def from_demo(cls) -> "Parallel":
@@ -89,19 +190,22 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         return cls(m2=m2)
 
     @classmethod
-    def from_parallel(cls, src: str, trg: str) -> "Parallel":
+    def from_parallel(
+        cls, src: str, trg: str, pool: Optional[StringPool] = None
+    ) -> "Parallel":
         """Make a Parallel instance from raw files.
 
         Args:
             src (str): Path to source file.
             trg (str): Path to target file.
+            pool (Optional[StringPool]): String pool for deduplication.
 
         Returns:
             Parallel: The Parallel instance.
         """
         srcs = open(src).read().rstrip().split("\n")
         trgs = open(trg).read().rstrip().split("\n")
-        return cls(srcs=srcs, trgs=trgs)
+        return cls(srcs=srcs, trgs=trgs, pool=pool)
 
     def load_m2(
         self, m2_contents: List[str], ref_id: int = 0
@@ -123,41 +227,37 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         srcs: List[str] = []
         trgs: List[str] = []
         edits_list: List[List[errant.edit.Edit]] = []
-        num_error_sent = 0
-        num_words = 0
-        num_edits = 0
-        num_corrected_token = 0
         for content in m2_contents:
             src, *edits = content.split("\n")
             src = src[2:]  # remove 'S '
+            if self.pool is not None:
+                src = self.pool.intern(src)
             edits = [
-                self.make_edit_instance(src, e[2:])
+                self.make_edit_instance(src, e[2:], pool=self.pool)
                 for e in edits
                 if e.split("|||")[1] not in ["noop", "UNK"]
                 and int(e.split("|||")[-1]) == ref_id
             ]
+            trg = apply_edits(src, edits)
+            if self.pool is not None:
+                trg = self.pool.intern(trg)
             srcs.append(src)
-            trgs.append(apply_edits(src, edits))
+            trgs.append(trg)
             edits_list.append(edits)
-            num_words += len(src.split(" "))
-            num_edits += len(edits)
-            num_corrected_token += sum(e.o_end - e.o_start for e in edits)
-            if len(edits) > 0:
-                num_error_sent += 1
-        self.num_sents = len(srcs)
-        self.num_error_sent = num_error_sent
-        self.num_words = num_words
-        self.num_edits = num_edits
-        self.num_corrected_token = num_corrected_token
+        self._set_stats(srcs, edits_list)
         return srcs, trgs, edits_list
 
     @staticmethod
-    def make_edit_instance(src, editstr: str) -> Edit:
+    def make_edit_instance(
+        src, editstr: str, pool: Optional[StringPool] = None
+    ) -> Edit:
         """Make an Edit instance from an edit string of the M2 format,
             such as "S 0 1|||..."
 
         Args:
             editstr (str): The edit string of the M2 format.
+            pool (Optional[StringPool]): If given, the error type and
+                short o_str/c_str are deduplicated through the pool.
 
         Returns:
             Edit: The Edit instance.
@@ -165,10 +265,15 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         tokens = src.split(" ")
         pos, etype, c_str, *others = editstr.split("|||")
         start, end = map(int, pos.split(" "))
+        o_str = " ".join(tokens[start:end])
+        if pool is not None:
+            etype = pool.intern(etype)
+            o_str = pool.intern_short(o_str)
+            c_str = pool.intern_short(c_str)
         return Edit(
             o_start=start,
             o_end=end,
-            o_str=" ".join(tokens[start:end]),
+            o_str=o_str,
             c_str=c_str,
             type=etype,
         )
@@ -190,16 +295,37 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
                     The edits extracted from each parallel pair.
         """
         annotator = errant.load("en")
+        if self.pool is not None:
+            # The caller still holds the original lists, so these are not counted as saved.
+            srcs = [self.pool.intern(s, owned=False) for s in srcs]
+            trgs = [self.pool.intern(t, owned=False) for t in trgs]
         edits_list = []
-        num_error_sent = 0
-        num_words = 0
-        num_edits = 0
-        num_corrected_token = 0
         for src, trg in tqdm(zip(srcs, trgs), total=len(srcs)):
             orig = annotator.parse(src)
             cor = annotator.parse(trg)
-            edits = annotator.annotate(orig, cor)
+            # Drop UNK edits in the same way as load_m2().
+            edits = [e for e in annotator.annotate(orig, cor) if e.type != "UNK"]
+            if self.pool is not None:
+                for e in edits:
+                    e.type = self.pool.intern(e.type)
+                    e.o_str = self.pool.intern_short(e.o_str)
+                    e.c_str = self.pool.intern_short(e.c_str)
             edits_list.append(edits)
+        self._set_stats(srcs, edits_list)
+        return srcs, trgs, edits_list
+
+    def _set_stats(self, srcs: List[str], edits_list: List[List[Edit]]) -> None:
+        """Compute statistics used by show_stats().
+
+        Args:
+            srcs (list[str]): The source sentences.
+            edits_list (list[list[errant.edit.Edit]]): The edits of each sentence.
+        """
+        num_error_sent = 0
+        num_words = 0
+        num_edits = 0
+        num_corrected_token = 0
+        for src, edits in zip(srcs, edits_list):
             num_words += len(src.split(" "))
             num_edits += len(edits)
             num_corrected_token += sum(e.o_end - e.o_start for e in edits)
@@ -210,7 +336,31 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         self.num_words = num_words
         self.num_edits = num_edits
         self.num_corrected_token = num_corrected_token
-        return srcs, trgs, edits_list
+
+    def subset(self, sent_ids: List[int]) -> "Parallel":
+        """Make a Parallel instance that contains only the specified sentences.
+        The sentences and edits are shared with this instance, not copied.
+
+        Args:
+            sent_ids (list[int]): The sentence ids to be kept.
+
+        Returns:
+            Parallel: The Parallel instance.
+
+        Raises:
+            ValueError: If sent_ids contains ids out of [0, num_sents).
+        """
+        for i in sent_ids:
+            if not 0 <= i < len(self.srcs):
+                raise ValueError(
+                    f"Sentence id {i} is out of range [0, {len(self.srcs)})."
+                )
+        gec = copy.copy(self)
+        gec.srcs = [self.srcs[i] for i in sent_ids]
+        gec.trgs = [self.trgs[i] for i in sent_ids]
+        gec.edits_list = [self.edits_list[i] for i in sent_ids]
+        gec._set_stats(gec.srcs, gec.edits_list)
+        return gec
 
     def show_stats(self, cat3: bool = False) -> None:
         """Show statistics of the loaded dataset.
@@ -286,16 +436,11 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
 
         Returns:
             str: The error type string.
+
+        Raises:
+            ValueError: If etype is not an ERRANT error type.
         """
-        # cat=1, M, R, U
-        # cat=2, e.g. DET, NOUN:NUM
-        # cat=3, M:DET, R:NOUN:NUM
-        if cat == 1:
-            return etype[0]
-        elif cat == 2:
-            return etype[2:]
-        else:
-            return etype
+        return _convert_etype(etype, cat)
 
     def ged_labels_sent(
         self, mode: str = "bin", return_id: bool = False
@@ -317,18 +462,10 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         """
         assert mode in self.GED_MODES
         labels = []
-        label2id = self.get_ged_label2id(mode=mode)
         for s, t, edits in zip(self.srcs, self.trgs, self.edits_list):
-            if s == t:
-                label = ["CORRECT"]
-            else:
-                if mode == "bin":
-                    label = ["INCORRECT"]
-                else:
-                    cat = int(mode[-1])
-                    label = list(set(self.convert_etype(e.type, cat) for e in edits))
-            if return_id:
-                label = [label2id[l] for l in label]
+            label = _ged_label_sent(
+                s, t, [e.type for e in edits], mode, return_id=return_id
+            )
             labels.append(label)
         assert len(labels) == len(self.srcs)
         return labels
@@ -353,25 +490,13 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         """
         assert mode in self.GED_MODES
         labels = []
-        label2id = self.get_ged_label2id(mode=mode)
         for s, edits in zip(self.srcs, self.edits_list):
-            label = ["CORRECT"] * len(s.split(" "))
-            for e in edits:
-                st = e.o_start
-                en = e.o_end
-                if e.o_start == e.o_end:
-                    # If missing error, we assign an incorrect label to the token on the right of the span.
-                    # This follows [Yuan+ 21]'s strategy (Sec. 4.2): https://aclanthology.org/2021.emnlp-main.687.pdf
-                    st = e.o_end
-                    en = e.o_end + 1
-                if mode == "bin":
-                    label[st:en] = ["INCORRECT"] * (en - st)
-                else:
-                    cat = int(mode[-1])
-                    t = self.convert_etype(e.type, cat)
-                    label[st:en] = [t] * (en - st)
-            if return_id:
-                label = [label2id[l] for l in label]
+            label = _ged_label_token(
+                s,
+                [(e.o_start, e.o_end, e.type) for e in edits],
+                mode,
+                return_id=return_id,
+            )
             labels.append(label)
         assert len(labels) == len(self.srcs)
         return labels
@@ -389,62 +514,7 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         Returns:
             dict[int, str]: The dictionary of {id: error type}.
         """
-        mru_cats = [
-            "ADJ",
-            "ADV",
-            "CONJ",
-            "CONTR",
-            "DET",
-            "NOUN",
-            "NOUN:POSS",
-            "OTHER",
-            "PART",
-            "PREP",
-            "PRON",
-            "PUNCT",
-            "VERB",
-            "VERB:FORM",
-            "VERB:TENSE",
-        ]
-        r_cats = [
-            "ADJ:FORM",
-            "MORPH",
-            "NOUN:INFL",
-            "NOUN:NUM",
-            "ORTH",
-            "SPELL",
-            "VERB:INFL",
-            "VERB:SVA",
-            "WO",
-        ]
-        cat1 = {0: "CORRECT"}
-        cat2 = {0: "CORRECT"}
-        cat3 = {0: "CORRECT"}
-        for i, c in enumerate("MRU"):
-            cat1[i + 1] = c
-        for i, c in enumerate(mru_cats + r_cats):
-            cat2[i + 1] = c
-        idx = 1
-        for c1 in "MRU":
-            for c2 in mru_cats:
-                cat3[idx] = c1 + ":" + c2
-                idx += 1
-            if c1 == "R":
-                for c2 in r_cats:
-                    cat3[idx] = c1 + ":" + c2
-                    idx += 1
-        assert len(cat1) == 4
-        assert len(cat2) == 25
-        assert len(cat3) == 55
-
-        if mode == "bin":
-            return {0: "CORRECT", 1: "INCORRECT"}
-        elif mode == "cat1":
-            return cat1
-        elif mode == "cat2":
-            return cat2
-        else:
-            return cat3
+        return dict(_GED_ID2LABEL.get(mode, _GED_ID2LABEL["cat3"]))
 
     def get_ged_label2id(self, mode: str = "bin") -> Dict[str, int]:
         """Get relationship between error types and their ids.
@@ -457,7 +527,284 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
                 - "cat3": CORRECT, M:NOUN, R:VERB:FORM, etc.
 
         Returns:
-            dict[str, int]: The dictionary of {id: error type}.
+            dict[str, int]: The dictionary of {error type: id}.
+        """
+        return dict(_GED_LABEL2ID.get(mode, _GED_LABEL2ID["cat3"]))
+
+    def export_ged_labels(
+        self,
+        out_dir: str,
+        mode: str = "bin",
+        chunk_size: int = 10000,
+        num_workers: int = 1,
+    ) -> None:
+        """Write token-level and sentence-level detection label ids to disk chunk by chunk.
+
+        The labels are never materialized for the whole corpus.
+        With num_workers > 1, at most 2 * num_workers chunks are pending in the pool
+        in addition to the one being built, so the labels of about
+        (2 * num_workers + 1) * chunk_size sentences are held on memory at once
+        (chunk_size sentences if num_workers == 1).
+        The following files are created in out_dir:
+            - token_labels.bin: uint8 label ids of all tokens, concatenated.
+            - token_offsets.bin: int64 offsets of length num_sents + 1,
+                i.e. the labels of the i-th sentence are token_labels[offsets[i]:offsets[i+1]].
+                The number of labels is len(src.split(" ")) + 1 if a missing error
+                is at the end of the sentence (see ged_labels_token()).
+            - sent_labels.bin, sent_offsets.bin: The same for sentence-level labels.
+                The ids of each sentence are sorted in ascending order.
+            - meta.json: mode, id2label, num_sents, and dtypes.
+        All binary files are little-endian, so they can be opened by e.g. numpy.memmap.
+        The files are written to temporary names and moved into out_dir only after
+        the export succeeds. meta.json is moved last, so its existence means the export is complete.
+
+        Args:
+            out_dir (str): Output directory. It is created if it does not exist.
+            mode (str): Error type category including binary setting.
+                - "bin": CORRECT or INCORRECT.
+                - "cat1": CORRECT, M, R, and U.
+                - "cat2": CORRECT, NOUN, VERB:FORM, etc.
+                - "cat3": CORRECT, M:NOUN, R:VERB:FORM, etc.
+            chunk_size (int): The number of sentences processed at once by a worker.
+            num_workers (int): The number of worker processes.
+                If 1, the labels are computed in the current process.
+        """
+        assert mode in self.GED_MODES
+        assert chunk_size > 0 and num_workers > 0
+        os.makedirs(out_dir, exist_ok=True)
+        names = ["token_labels", "token_offsets", "sent_labels", "sent_offsets"]
+        # Write to temporary files first so that a failed export does not
+        # leave out_dir looking valid.
+        paths = {name: os.path.join(out_dir, name + ".bin") for name in names}
+        paths["meta"] = os.path.join(out_dir, "meta.json")
+        tmp_paths = {name: path + ".tmp" for name, path in paths.items()}
+        files = dict()
+        token_offset = 0
+        sent_offset = 0
+
+        def chunks():
+            for i in range(0, len(self.srcs), chunk_size):
+                # Pass only primitive values so that the chunks can be pickled
+                # even if the edits hold spaCy objects.
+                yield (
+                    [
+                        (s, t, [(e.o_start, e.o_end, e.type) for e in edits])
+                        for s, t, edits in zip(
+                            self.srcs[i : i + chunk_size],
+                            self.trgs[i : i + chunk_size],
+                            self.edits_list[i : i + chunk_size],
+                        )
+                    ],
+                    mode,
+                )
+
+        def write(result):
+            nonlocal token_offset, sent_offset
+            token_labels, token_lens, sent_labels, sent_lens = result
+            _write_array(files["token_labels"], token_labels)
+            _write_array(files["sent_labels"], sent_labels)
+            token_offsets = array("q")
+            for n in token_lens:
+                token_offset += n
+                token_offsets.append(token_offset)
+            sent_offsets = array("q")
+            for n in sent_lens:
+                sent_offset += n
+                sent_offsets.append(sent_offset)
+            _write_array(files["token_offsets"], token_offsets)
+            _write_array(files["sent_offsets"], sent_offsets)
+
+        try:
+            with ExitStack() as stack:
+                for name in names:
+                    files[name] = stack.enter_context(open(tmp_paths[name], "wb"))
+                _write_array(files["token_offsets"], array("q", [0]))
+                _write_array(files["sent_offsets"], array("q", [0]))
+                if num_workers == 1:
+                    for chunk in chunks():
+                        write(_ged_label_ids_chunk(chunk))
+                else:
+                    with Pool(num_workers) as pool:
+                        # Pool.imap() consumes the input eagerly, so we keep a sliding window
+                        # of at most 2 * num_workers pending chunks to bound the memory
+                        # while keeping all workers busy.
+                        pending = deque()
+                        for chunk in chunks():
+                            if len(pending) == 2 * num_workers:
+                                write(pending.popleft().get())
+                            pending.append(
+                                pool.apply_async(_ged_label_ids_chunk, (chunk,))
+                            )
+                        while pending:
+                            write(pending.popleft().get())
+
+            id2label = self.get_ged_id2label(mode=mode)
+            meta = {
+                "mode": mode,
+                "num_sents": len(self.srcs),
+                "label_dtype": "uint8",
+                "offset_dtype": "int64",
+                "id2label": {str(k): v for k, v in id2label.items()},
+            }
+            with open(tmp_paths["meta"], "w") as f:
+                json.dump(meta, f, indent=2)
+        except BaseException:
+            # Remove only the temporary files created by this export.
+            created = [tmp_paths[name] for name in files]
+            if os.path.isfile(tmp_paths["meta"]):
+                created.append(tmp_paths["meta"])
+            for path in created:
+                os.remove(path)
+            raise
+
+        # meta.json is removed first and replaced last,
+        # so the directory has meta.json only if all .bin files are complete.
+        if os.path.exists(paths["meta"]):
+            os.remove(paths["meta"])
+        for name in names:
+            os.replace(tmp_paths[name], paths[name])
+        os.replace(tmp_paths["meta"], paths["meta"])
+
+    @staticmethod
+    def load_ged_labels(out_dir: str, level: str = "token") -> List[List[int]]:
+        """Load detection label ids written by export_ged_labels().
+
+        Note that this loads all labels on memory.
+        Use numpy.memmap to the .bin files for random access to a large corpus.
+
+        Args:
+            out_dir (str): The directory passed to export_ged_labels().
+            level (str): "token" or "sent".
+
+        Returns:
+            list[list[int]]: The detection label ids of each sentence.
         """
-        id2label = self.get_ged_id2label(mode)
-        return {v: k for k, v in id2label.items()}
+        assert level in ["token", "sent"]
+        meta_path = os.path.join(out_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(
+                f"{meta_path} does not exist. The export may be incomplete."
+            )
+        with open(meta_path) as f:
+            meta = json.load(f)
+        labels = _read_array(os.path.join(out_dir, level + "_labels.bin"), "B")
+        offsets = _read_array(os.path.join(out_dir, level + "_offsets.bin"), "q")
+        if len(offsets) != meta["num_sents"] + 1 or len(labels) != offsets[-1]:
+            raise ValueError(f"The label files in {out_dir} are inconsistent.")
+        return [
+            labels[offsets[i] : offsets[i + 1]].tolist()
+            for i in range(len(offsets) - 1)
+        ]
+
+
+def _lookup_etype(etype: str) -> Tuple[int, int, int]:
+    """Return (cat1 id, cat2 id, cat3 id) of an ERRANT error type."""
+    ids = _ETYPE2IDS.get(etype)
+    if ids is None:
+        raise ValueError(
+            f"Unknown ERRANT error type: {etype!r}. "
+            "Expected one like 'R:VERB:SVA' (UNK and noop are not supported)."
+        )
+    return ids
+
+
+def _convert_etype(etype: str, cat: int = 1) -> str:
+    # cat=1, M, R, U
+    # cat=2, e.g. DET, NOUN:NUM
+    # cat=3, M:DET, R:NOUN:NUM
+    cat1_id, cat2_id, cat3_id = _lookup_etype(etype)
+    if cat == 1:
+        return _GED_ID2LABEL["cat1"][cat1_id]
+    elif cat == 2:
+        return _GED_ID2LABEL["cat2"][cat2_id]
+    else:
+        return _GED_ID2LABEL["cat3"][cat3_id]
+
+
+def _ged_label_sent(
+    src: str, trg: str, etypes: List[str], mode: str, return_id: bool = False
+) -> List[Union[str, int]]:
+    """Sentence-level detection labels of a single sentence.
+    If return_id is True, the ids are taken from the etype table directly.
+    """
+    if src == trg:
+        return [_GED_LABEL2ID[mode]["CORRECT"]] if return_id else ["CORRECT"]
+    if mode == "bin":
+        return [_GED_LABEL2ID[mode]["INCORRECT"]] if return_id else ["INCORRECT"]
+    cat = int(mode[-1])
+    if return_id:
+        return list(set(_lookup_etype(t)[cat - 1] for t in etypes))
+    return list(set(_convert_etype(t, cat) for t in etypes))
+
+
+def _ged_label_token(
+    src: str, spans: List[Tuple[int, int, str]], mode: str, return_id: bool = False
+) -> List[Union[str, int]]:
+    """Token-level detection labels of a single sentence.
+    spans is a list of (o_start, o_end, type) of the edits.
+    If return_id is True, the ids are taken from the etype table directly.
+    Note that the labels are one longer than len(src.split(" "))
+    when a missing error is at the end of the sentence.
+    """
+    if return_id:
+        correct = _GED_LABEL2ID[mode]["CORRECT"]
+        incorrect = _GED_LABEL2ID["bin"]["INCORRECT"]
+    else:
+        correct = "CORRECT"
+        incorrect = "INCORRECT"
+    label = [correct] * len(src.split(" "))
+    for st, en, etype in spans:
+        if st == en:
+            # If missing error, we assign an incorrect label to the token on the right of the span.
+            # This follows [Yuan+ 21]'s strategy (Sec. 4.2): https://aclanthology.org/2021.emnlp-main.687.pdf
+            st = en
+            en = en + 1
+        if mode == "bin":
+            label[st:en] = [incorrect] * (en - st)
+        else:
+            cat = int(mode[-1])
+            if return_id:
+                t = _lookup_etype(etype)[cat - 1]
+            else:
+                t = _convert_etype(etype, cat)
+            label[st:en] = [t] * (en - st)
+    return label
+
+
+def _ged_label_ids_chunk(
+    args: Tuple[List[Tuple[str, str, List[Tuple[int, int, str]]]], str],
+) -> Tuple[array, List[int], array, List[int]]:
+    """Compute label ids for a chunk of sentences. Used by export_ged_labels()."""
+    chunk, mode = args
+    token_labels = array("B")
+    sent_labels = array("B")
+    token_lens = []
+    sent_lens = []
+    for src, trg, spans in chunk:
+        token_label = _ged_label_token(src, spans, mode, return_id=True)
+        sent_label = sorted(
+            _ged_label_sent(
+                src, trg, [t for _, _, t in spans], mode, return_id=True
+            )
+        )
+        token_labels.extend(token_label)
+        sent_labels.extend(sent_label)
+        token_lens.append(len(token_label))
+        sent_lens.append(len(sent_label))
+    return token_labels, token_lens, sent_labels, sent_lens
+
+
+def _write_array(f, arr: array) -> None:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    arr.tofile(f)
+
+
+def _read_array(path: str, typecode: str) -> array:
+    arr = array(typecode)
+    with open(path, "rb") as f:
+        arr.frombytes(f.read())
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
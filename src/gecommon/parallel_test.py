@@ -1,3 +1,6 @@
+import copy
+import json
+import os
 from .parallel import Parallel, Edit
 import pytest
 
@@ -131,3 +134,82 @@ A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||0
         gec.show_etype_stats(cat=1)
         gec.show_etype_stats(cat=2)
         gec.show_etype_stats(cat=3)
+
+    @pytest.mark.parametrize("mode", ["bin", "cat1", "cat2", "cat3"])
+    @pytest.mark.parametrize("num_workers", [1, 2])
+    def test_export_ged_labels(self, demo_instance, tmp_path, mode, num_workers):
+        out_dir = str(tmp_path / "labels")
+        demo_instance.export_ged_labels(
+            out_dir, mode=mode, chunk_size=2, num_workers=num_workers
+        )
+        assert Parallel.load_ged_labels(
+            out_dir, level="token"
+        ) == demo_instance.ged_labels_token(mode=mode, return_id=True)
+        assert Parallel.load_ged_labels(out_dir, level="sent") == [
+            sorted(l) for l in demo_instance.ged_labels_sent(mode=mode, return_id=True)
+        ]
+
+    def test_ged_label_tables(self, demo_instance):
+        id2label = demo_instance.get_ged_id2label(mode="cat3")
+        label2id = demo_instance.get_ged_label2id(mode="cat3")
+        assert all(label2id[v] == k for k, v in id2label.items())
+        assert id2label[38] == "R:VERB:SVA"
+        # The returned dictionaries are plain copies.
+        assert json.loads(json.dumps(label2id)) == label2id
+        assert copy.deepcopy(id2label) == id2label
+        id2label[0] = "INCORRECT"
+        assert demo_instance.get_ged_id2label(mode="cat3")[0] == "CORRECT"
+
+    def test_convert_unknown_etype(self, demo_instance):
+        with pytest.raises(ValueError, match="Unknown ERRANT error type"):
+            demo_instance.convert_etype("R:UNKNOWN", cat=2)
+
+    def test_export_ged_labels_failure(self, demo_instance, tmp_path):
+        out_dir = str(tmp_path / "labels")
+        demo_instance.export_ged_labels(out_dir, mode="cat3")
+        expected = Parallel.load_ged_labels(out_dir, level="token")
+        broken = demo_instance.subset([0, 1])
+        broken.edits_list = [[Edit(0, 1, "This", "These", type="R:UNKNOWN")], []]
+        with pytest.raises(ValueError):
+            broken.export_ged_labels(out_dir, mode="cat3")
+        # The previous export is left as it was.
+        assert sorted(os.listdir(out_dir)) == [
+            "meta.json",
+            "sent_labels.bin",
+            "sent_offsets.bin",
+            "token_labels.bin",
+            "token_offsets.bin",
+        ]
+        assert Parallel.load_ged_labels(out_dir, level="token") == expected
+
+    def test_load_ged_labels_incomplete(self, demo_instance, tmp_path):
+        out_dir = str(tmp_path / "labels")
+        demo_instance.export_ged_labels(out_dir)
+        os.remove(os.path.join(out_dir, "meta.json"))
+        with pytest.raises(FileNotFoundError):
+            Parallel.load_ged_labels(out_dir)
+
+    def test_export_ged_labels_open_failure(self, demo_instance, tmp_path):
+        out_dir = tmp_path / "labels"
+        out_dir.mkdir()
+        # The third temporary file cannot be opened.
+        (out_dir / "sent_labels.bin.tmp").mkdir()
+        with pytest.raises(IsADirectoryError) as e:
+            demo_instance.export_ged_labels(str(out_dir))
+        assert e.value.filename == str(out_dir / "sent_labels.bin.tmp")
+        assert sorted(os.listdir(out_dir)) == ["sent_labels.bin.tmp"]
+
+    @pytest.mark.parametrize("mode", ["bin", "cat1", "cat2", "cat3"])
+    def test_ged_label_ids(self, demo_instance, mode):
+        label2id = demo_instance.get_ged_label2id(mode=mode)
+        assert demo_instance.ged_labels_token(mode=mode, return_id=True) == [
+            [label2id[l] for l in labels]
+            for labels in demo_instance.ged_labels_token(mode=mode)
+        ]
+        assert [
+            sorted(labels)
+            for labels in demo_instance.ged_labels_sent(mode=mode, return_id=True)
+        ] == [
+            sorted(label2id[l] for l in labels)
+            for labels in demo_instance.ged_labels_sent(mode=mode)
+        ]
@@ -0,0 +1,80 @@
+import sys
+
+
+class StringPool:
+    """A pool to share identical strings among Parallel instances.
+
+    Unlike sys.intern(), the strings are released when the pool is deleted.
+    """
+
+    def __init__(self, max_len: int = 32):
+        """Initialize a StringPool instance.
+
+        Args:
+            max_len (int): Correction and original strings of edits longer than this
+                are not pooled by Parallel since they are rarely repeated.
+                Sentences and error types are always pooled.
+        """
+        self.max_len = max_len
+        self.pool = dict()
+        self.num_hits = 0
+        self.bytes_saved = 0
+
+    def intern(self, s: str, owned: bool = True) -> str:
+        """Return the pooled string equal to s.
+
+        Args:
+            s (str): The string.
+            owned (bool): Whether the caller holds the only reference to s.
+                If False, e.g. s is still referenced by the user's list,
+                replacing s does not free it and it is not counted in bytes_saved.
+
+        Returns:
+            str: The pooled string. It is s itself if s is seen for the first time.
+        """
+        pooled = self.pool.setdefault(s, s)
+        if pooled is not s:
+            self.num_hits += 1
+            if owned:
+                self.bytes_saved += sys.getsizeof(s)
+        return pooled
+
+    def intern_short(self, s: str, owned: bool = True) -> str:
+        """Same as intern(), but s is pooled only if len(s) <= max_len.
+
+        Args:
+            s (str): The string.
+            owned (bool): The same as intern().
+
+        Returns:
+            str: The pooled string, or s itself if s is longer than max_len.
+        """
+        if len(s) > self.max_len:
+            return s
+        return self.intern(s, owned=owned)
+
+    def stats(self) -> dict:
+        """Get statistics of the pool.
+
+        Returns:
+            dict: The dictionary containing
+                - num_strings (int): The number of unique strings in the pool.
+                - num_hits (int): The number of strings replaced by pooled ones.
+                - bytes_saved (int): The gross size of the replaced strings
+                    that were created by gecommon, i.e. freed by the replacement.
+                    Strings passed by the user (e.g. srcs of Parallel(srcs=..., trgs=...))
+                    are not counted since the user still holds them.
+                - pool_bytes (int): The size of the pool dict itself,
+                    which is the cost of the deduplication.
+                - net_bytes_saved (int): bytes_saved - pool_bytes.
+                    This can be negative, e.g. when a single Parallel instance
+                    with few duplicates uses a pool.
+        """
+        pool_bytes = sys.getsizeof(self.pool)
+        return {
+            "num_strings": len(self.pool),
+            "num_hits": self.num_hits,
+            "bytes_saved": self.bytes_saved,
+            "pool_bytes": pool_bytes,
+            "net_bytes_saved": self.bytes_saved - pool_bytes,
+        }
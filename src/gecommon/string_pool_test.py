@@ -0,0 +1,69 @@
+from .parallel import Parallel
+from .string_pool import StringPool
+import pytest
+
+
+class TestStringPool:
+    @pytest.fixture(scope="class")
+    def m2(self):
+        return """S This are gramamtical sentence .
+A 1 2|||R:VERB:SVA|||is|||REQUIRED|||-NONE-|||0
+A 2 3|||R:SPELL|||grammatical|||REQUIRED|||-NONE-|||0
+A 1 2|||R:VERB:SVA|||is|||REQUIRED|||-NONE-|||1
+
+S This is are a gram matical sentence .
+A 2 3|||U:VERB||||||REQUIRED|||-NONE-|||0
+A 4 6|||R:ORTH|||grammatical|||REQUIRED|||-NONE-|||0
+A -1 -1|||noop|||-NONE-|||REQUIRED|||-NONE-|||1
+
+""".rstrip().split("\n\n")
+
+    def test_intern(self):
+        pool = StringPool(max_len=3)
+        a = "".join(["th", "e"])
+        b = "".join(["t", "he"])
+        assert a is not b
+        assert pool.intern(a) is a
+        assert pool.intern(b) is a
+        long = "".join(["abc", "d"])
+        assert pool.intern_short(long) is long
+        assert pool.intern_short("".join(["abc", "d"])) is not long
+        assert pool.stats()["num_strings"] == 1
+        assert pool.stats()["num_hits"] == 1
+        assert pool.stats()["bytes_saved"] > 0
+        stats = pool.stats()
+        assert stats["pool_bytes"] > 0
+        assert stats["net_bytes_saved"] == stats["bytes_saved"] - stats["pool_bytes"]
+
+    def test_parallel(self, m2):
+        pool = StringPool()
+        ref0 = Parallel(m2=m2, ref_id=0, pool=pool)
+        ref1 = Parallel(m2=m2, ref_id=1, pool=pool)
+        assert ref0.pool is pool
+        assert all(s0 is s1 for s0, s1 in zip(ref0.srcs, ref1.srcs))
+        # The target of ref 1 without edits is the same object as the source.
+        assert ref1.trgs[1] is ref1.srcs[1]
+        e0 = ref0.edits_list[0][0]
+        e1 = ref1.edits_list[0][0]
+        assert e0.type is e1.type
+        assert e0.c_str is e1.c_str
+        assert ref0.edits_list[0][1].c_str is ref0.edits_list[1][1].c_str
+        assert pool.stats()["bytes_saved"] > 0
+
+    def test_same_results(self, m2):
+        for ref_id in [0, 1]:
+            gec = Parallel(m2=m2, ref_id=ref_id)
+            pooled = Parallel(m2=m2, ref_id=ref_id, pool=StringPool())
+            assert gec.srcs == pooled.srcs
+            assert gec.trgs == pooled.trgs
+            assert gec.ged_labels_token(mode="cat3") == pooled.ged_labels_token(
+                mode="cat3"
+            )
+
+    def test_not_owned(self):
+        pool = StringPool()
+        a = "".join(["th", "e"])
+        pool.intern(a)
+        assert pool.intern("".join(["t", "he"]), owned=False) is a
+        assert pool.stats()["num_hits"] == 1
+        assert pool.stats()["bytes_saved"] == 0